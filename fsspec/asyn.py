@@ -212,6 +212,10 @@ async def _run_coros_in_chunks(
 ):
     """Run the given coroutines in  chunks.
 
+    At most ``batch_size`` coroutines run at any one time; as soon as one
+    finishes, the next is started, so that a single slow coroutine does not
+    hold up the whole batch. Results are returned in the order of ``coros``.
+
     Parameters
     ----------
     coros: list of coroutines to run
@@ -239,20 +243,31 @@ async def _run_coros_in_chunks(
         batch_size = len(coros)
 
     assert batch_size > 0
-    results = []
-    for start in range(0, len(coros), batch_size):
-        chunk = [
-            asyncio.Task(asyncio.wait_for(c, timeout=timeout))
-            for c in coros[start : start + batch_size]
-        ]
-        if callback is not _DEFAULT_CALLBACK:
-            [
-                t.add_done_callback(lambda *_, **__: callback.relative_update(1))
-                for t in chunk
-            ]
-        results.extend(
-            await asyncio.gather(*chunk, return_exceptions=return_exceptions),
-        )
+
+    async def _run_coro(coro, i):
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout), i
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            return e, i
+        finally:
+            callback.relative_update(1)
+
+    results = [None] * len(coros)
+    queue = iter(enumerate(coros))
+    pending = set()
+    while True:
+        for i, coro in queue:
+            pending.add(asyncio.ensure_future(_run_coro(coro, i)))
+            if len(pending) >= batch_size:
+                break
+        if not pending:
+            break
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            result, i = await task
+            results[i] = result
     return results
 
 
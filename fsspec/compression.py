@@ -1,4 +1,6 @@
 """Helper functions for a standard streaming compression API"""
+import asyncio
+import importlib.util
 from zipfile import ZipFile
 
 import fsspec.utils
@@ -68,48 +70,73 @@ def unzip(infile, mode="rb", filename=None, **kwargs):
 
 register_compression("zip", unzip, "zip")
 
-try:
-    from bz2 import BZ2File
-except ImportError:
-    pass
-else:
-    register_compression("bz2", BZ2File, "bz2")
+# The third-party codec libraries below are only imported when a file is
+# actually opened with them, so that importing fsspec does not load every
+# compression library that happens to be installed.
+
+
+def _available(module):
+    """Whether the given module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+if _available("_bz2"):
 
-try:  # pragma: no cover
-    from isal import igzip
+    def bz2_file(infile, mode="rb", **kwargs):
+        from bz2 import BZ2File
+
+        return BZ2File(infile, mode=mode, **kwargs)
+
+    register_compression("bz2", bz2_file, "bz2")
+
+if _available("isal"):  # pragma: no cover
 
     def isal(infile, mode="rb", **kwargs):
+        from isal import igzip
+
         return igzip.IGzipFile(fileobj=infile, mode=mode, **kwargs)
 
     register_compression("gzip", isal, "gz")
-except ImportError:
-    from gzip import GzipFile
+else:
 
-    register_compression(
-        "gzip", lambda f, **kwargs: GzipFile(fileobj=f, **kwargs), "gz"
-    )
+    def gzip_file(infile, **kwargs):
+        from gzip import GzipFile
 
-try:
-    from lzma import LZMAFile
+        return GzipFile(fileobj=infile, **kwargs)
 
-    register_compression("lzma", LZMAFile, "xz")
-    register_compression("xz", LZMAFile, "xz", force=True)
-except ImportError:
-    pass
+    register_compression("gzip", gzip_file, "gz")
 
-try:
-    import lzmaffi
+if _available("lzmaffi"):
 
-    register_compression("lzma", lzmaffi.LZMAFile, "xz", force=True)
-    register_compression("xz", lzmaffi.LZMAFile, "xz", force=True)
-except ImportError:
-    pass
+    def lzma_file(infile, mode="rb", **kwargs):
+        import lzmaffi
+
+        return lzmaffi.LZMAFile(infile, mode=mode, **kwargs)
+
+    register_compression("lzma", lzma_file, "xz")
+    register_compression("xz", lzma_file, "xz", force=True)
+
+elif _available("_lzma"):
+
+    def lzma_file(infile, mode="rb", **kwargs):
+        from lzma import LZMAFile
+
+        return LZMAFile(infile, mode=mode, **kwargs)
+
+    register_compression("lzma", lzma_file, "xz")
+    register_compression("xz", lzma_file, "xz", force=True)
 
 
 class SnappyFile(AbstractBufferedFile):
     def __init__(self, infile, mode, **kwargs):
         import snappy
 
+        if not hasattr(snappy, "compress"):
+            # an unrelated package of the same name, not python-snappy
+            raise ImportError("snappy compression requires python-snappy")
         super().__init__(
             fs=None, path="snappy", mode=mode.strip("b") + "b", size=999999999, **kwargs
         )
@@ -137,38 +164,105 @@ class SnappyFile(AbstractBufferedFile):
         return self.codec.decompress(data)
 
 
-try:
-    import snappy
-
-    snappy.compress
+if _available("snappy"):
     # Snappy may use the .sz file extension, but this is not part of the
     # standard implementation.
     register_compression("snappy", SnappyFile, [])
 
-except (ImportError, NameError, AttributeError):
-    pass
+if _available("lz4"):
+
+    def lz4_file(infile, mode="rb", **kwargs):
+        import lz4.frame
+
+        return lz4.frame.open(infile, mode=mode, **kwargs)
 
-try:
-    import lz4.frame
+    register_compression("lz4", lz4_file, "lz4")
 
-    register_compression("lz4", lz4.frame.open, "lz4")
-except ImportError:
-    pass
+if _available("zstandard"):
 
-try:
-    import zstandard as zstd
+    def zstandard_file(infile, mode="rb", level=10, **kwargs):
+        import zstandard as zstd
 
-    def zstandard_file(infile, mode="rb"):
         if "r" in mode:
             cctx = zstd.ZstdDecompressor()
             return cctx.stream_reader(infile)
         else:
-            cctx = zstd.ZstdCompressor(level=10)
+            cctx = zstd.ZstdCompressor(level=level)
             return cctx.stream_writer(infile)
 
     register_compression("zstd", zstandard_file, "zst")
-except ImportError:
-    pass
+    # also allow the file extension as the compression name
+    register_compression("zst", zstandard_file, [])
+
+
+class _SyncReader:
+    """Blocking file-like view of an async file, for use from a worker thread
+
+    Each read is scheduled on ``loop``, which must not be the current thread's
+    loop, and waited for.
+    """
+
+    def __init__(self, afile, loop):
+        self.afile = afile
+        self.loop = loop
+
+    def read(self, length=-1):
+        return asyncio.run_coroutine_threadsafe(
+            self.afile.read(length), self.loop
+        ).result()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def close(self):
+        pass
+
+    @property
+    def closed(self):
+        return self.afile.closed
+
+
+class AsyncCompressedReader:
+    """Decompress an async file without blocking the event loop
+
+    The decompressor runs in a thread pool, and pulls compressed bytes from
+    the wrapped async file on the event loop, so that fetching and decoding
+    overlap rather than the decoding stalling all other I/O.
+
+    Parameters
+    ----------
+    afile: async file-like
+        Object with ``async read(length)`` and ``async close()``, such as
+        returned by ``AsyncFileSystem.open_async``
+    compression: str
+        A key of ``compr``
+    executor: concurrent.futures.Executor or None
+        Where to run decompression; the loop's default executor if None. Its
+        threads wait on reads done by the loop, so a dedicated pool is safer
+        if that I/O may itself need the default executor.
+    """
+
+    def __init__(self, afile, compression, executor=None):
+        self.afile = afile
+        self.executor = executor
+        self.loop = asyncio.get_running_loop()
+        self._raw = compr[compression](_SyncReader(afile, self.loop), mode="rb")
+
+    async def read(self, length=-1):
+        return await self.loop.run_in_executor(self.executor, self._raw.read, length)
+
+    async def close(self):
+        await self.loop.run_in_executor(self.executor, self._raw.close)
+        await self.afile.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
 
 
 def available_compressions():
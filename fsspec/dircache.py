@@ -1,7 +1,12 @@
+import json
+import os
 import time
 from collections.abc import MutableMapping
 from functools import lru_cache
 
+# clock for listings expiry; module-level so that tests can replace it
+_time = time.monotonic
+
 
 class DirCache(MutableMapping):
     """
@@ -55,7 +60,7 @@ class DirCache(MutableMapping):
 
     def __getitem__(self, item):
         if self.listings_expiry_time is not None:
-            if self._times.get(item, 0) - time.time() < -self.listings_expiry_time:
+            if self._times.get(item, 0) - _time() < -self.listings_expiry_time:
                 del self._cache[item]
         if self.max_paths:
             self._q(item)
@@ -81,7 +86,7 @@ class DirCache(MutableMapping):
             self._q(key)
         self._cache[key] = value
         if self.listings_expiry_time is not None:
-            self._times[key] = time.time()
+            self._times[key] = _time()
 
     def __delitem__(self, key):
         del self._cache[key]
@@ -96,3 +101,167 @@ class DirCache(MutableMapping):
             DirCache,
             (self.use_listings_cache, self.listings_expiry_time, self.max_paths),
         )
+
+
+class FileDirCache(MutableMapping):
+    """
+    Caching of directory listings on local disk, so that they can be reused
+    by other processes or sessions.
+
+    Has the same structure as ``DirCache``, and is backed by
+    ``diskcache.Cache``, which must be installed. If ``orjson`` is also
+    installed, listings that it can round-trip are stored as tagged JSON
+    rather than pickled, which is faster to write and read back. Such entries
+    can still be read by processes without ``orjson``.
+    """
+
+    def __init__(
+        self,
+        use_listings_cache=True,
+        listings_expiry_time=None,
+        listings_cache_location=None,
+        namespace=None,
+        listings_cache_size_limit=2**30,
+        max_paths=None,
+        **kwargs,
+    ):
+        """
+
+        Parameters
+        ----------
+        use_listings_cache: bool
+            If False, this cache never returns items, but always reports KeyError,
+            and setting items has no effect
+        listings_expiry_time: int or float (optional)
+            Time in seconds that a listing is considered valid. If None,
+            listings do not expire.
+        listings_cache_location: str (optional)
+            Directory in which to store the listings. If None, the per-user
+            directory ``fsspec/dircache`` under ``$XDG_CACHE_HOME`` (by default
+            ``~/.cache``) is used, created readable by the current user only.
+        namespace: str (optional)
+            Subdirectory of the location to use, so that listings made with
+            different options (e.g., credentials) are not shared.
+        listings_cache_size_limit: int
+            Approximate size in bytes of the cache on disk, beyond which the
+            least recently used listings are evicted.
+        max_paths: None
+            Not supported, since the cache is bounded by size rather than by
+            the number of listings; use ``listings_cache_size_limit``.
+        """
+        import diskcache
+
+        if max_paths is not None:
+            raise ValueError(
+                "FileDirCache is bounded by listings_cache_size_limit, " "not max_paths"
+            )
+        if listings_cache_location is None:
+            listings_cache_location = _default_location()
+        path = listings_cache_location
+        if namespace is not None:
+            path = os.path.join(path, namespace)
+        self._cache = diskcache.Cache(
+            path,
+            disk=_json_disk(),
+            size_limit=listings_cache_size_limit,
+            eviction_policy="least-recently-used",
+        )
+        self.use_listings_cache = use_listings_cache
+        self.listings_expiry_time = listings_expiry_time
+        self.listings_cache_location = listings_cache_location
+        self.namespace = namespace
+        self.listings_cache_size_limit = listings_cache_size_limit
+
+    def __getitem__(self, item):
+        if not self.use_listings_cache:
+            raise KeyError(item)
+        return self._cache[item]  # maybe raises KeyError
+
+    def clear(self):
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, item):
+        return self.use_listings_cache and item in self._cache
+
+    def __setitem__(self, key, value):
+        if not self.use_listings_cache:
+            return
+        self._cache.set(key, value, expire=self.listings_expiry_time)
+
+    def __delitem__(self, key):
+        del self._cache[key]
+
+    def __iter__(self):
+        return (k for k in list(self._cache) if k in self)
+
+    def __reduce__(self):
+        return (
+            FileDirCache,
+            (
+                self.use_listings_cache,
+                self.listings_expiry_time,
+                self.listings_cache_location,
+                self.namespace,
+                self.listings_cache_size_limit,
+            ),
+        )
+
+
+def _default_location():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    path = os.path.join(base, "fsspec", "dircache")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+# marks values stored as JSON, which never starts with a NUL byte
+_JSON_TAG = b"\x00fsspec-json\x00"
+
+
+def _import_orjson():
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+@lru_cache(None)
+def _json_disk():
+    import diskcache
+
+    # only imported here, so that importing fsspec does not load it
+    orjson = _import_orjson()
+    loads = orjson.loads if orjson is not None else json.loads
+
+    class JSONDisk(diskcache.Disk):
+        """Stores values as tagged JSON where orjson can round-trip them
+
+        Anything else (including when orjson is not installed) is stored as
+        usual. Tagged values are decoded with the json module if need be.
+        """
+
+        def store(self, value, read, key=diskcache.core.UNKNOWN):
+            if not read and orjson is not None:
+                try:
+                    encoded = orjson.dumps(value)
+                except TypeError:
+                    pass
+                else:
+                    # e.g., tuples would come back as lists
+                    if orjson.loads(encoded) == value:
+                        value = _JSON_TAG + encoded
+            return super().store(value, read, key=key)
+
+        def fetch(self, mode, filename, value, read):
+            out = super().fetch(mode, filename, value, read)
+            if isinstance(out, bytes) and out.startswith(_JSON_TAG):
+                out = loads(out[len(_JSON_TAG) :])
+            return out
+
+    return JSONDisk
@@ -1,10 +1,13 @@
 from __future__ import absolute_import, division, print_function
 
 import asyncio
+import atexit
 import io
 import logging
 import re
 import weakref
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 from urllib.parse import urlparse
 
@@ -12,8 +15,17 @@ import aiohttp
 import requests
 import yarl
 
-from fsspec.asyn import AbstractAsyncStreamedFile, AsyncFileSystem, sync, sync_wrapper
+from fsspec.asyn import (
+    AbstractAsyncStreamedFile,
+    AsyncFileSystem,
+    _run_coros_in_chunks,
+    sync,
+    sync_wrapper,
+)
 from fsspec.callbacks import _DEFAULT_CALLBACK
+from fsspec.compression import AsyncCompressedReader
+from fsspec.core import get_compression
+from fsspec.dircache import FileDirCache
 from fsspec.exceptions import FSTimeoutError
 from fsspec.spec import AbstractBufferedFile
 from fsspec.utils import DEFAULT_BLOCK_SIZE, isfilelike, nullcontext, tokenize
@@ -21,15 +33,47 @@ from fsspec.utils import DEFAULT_BLOCK_SIZE, isfilelike, nullcontext, tokenize
 from ..caching import AllBytes
 
 # https://stackoverflow.com/a/15926317/3821154
-ex = re.compile(r"""<(a|A)\s+(?:[^>]*?\s+)?(href|HREF)=["'](?P<url>[^"']+)""")
+ex = re.compile(r"""<[aA]\s+(?:[^>]*?\s+)?(?:href|HREF)=["'](?P<url>[^"']+)""")
 ex2 = re.compile(r"""(?P<url>http[s]?://[-a-zA-Z0-9@:%_+.~#?&/=]+)""")
+content_range_ex = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
 logger = logging.getLogger("fsspec.http")
 
 
+class _RangeIgnored(Exception):
+    """A range request was not answered with the requested part"""
+
+
 async def get_client(**kwargs):
     return aiohttp.ClientSession(**kwargs)
 
 
+# connection pools shared between synchronous HTTPFileSystem instances that use
+# the default get_client, as {loop: connector}; each instance still has its
+# own session, and so its own cookies
+_connectors: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]"
+) = weakref.WeakKeyDictionary()
+
+
+def _shared_connector(loop):
+    """Connector for sessions on this loop, so that connections are kept alive
+    across filesystem instances. Must be called on the loop.
+    """
+    connector = _connectors.get(loop)
+    if connector is None or connector.closed:
+        connector = _connectors[loop] = aiohttp.TCPConnector()
+    return connector
+
+
+@atexit.register
+def _close_shared_connectors():
+    for loop, connector in list(_connectors.items()):
+        if loop.is_running():
+            loop.call_soon_threadsafe(connector._close)
+        else:
+            connector._close()
+
+
 class HTTPFileSystem(AsyncFileSystem):
     """
     Simple File-System for fetching data via HTTP(S)
@@ -41,6 +85,8 @@ class HTTPFileSystem(AsyncFileSystem):
     """
 
     sep = "/"
+    #: Most byte ranges to put in the Range header of one request by cat_ranges
+    max_ranges_per_request = 100
 
     def __init__(
         self,
@@ -55,6 +101,9 @@ class HTTPFileSystem(AsyncFileSystem):
         client_kwargs=None,
         get_client=get_client,
         encoded=False,
+        range_split_threshold=16 * 2**20,
+        range_split_parts=4,
+        parallel_ls=False,
         **storage_options,
     ):
         """
@@ -79,7 +128,26 @@ class HTTPFileSystem(AsyncFileSystem):
         get_client: Callable[..., aiohttp.ClientSession]
             A callable which takes keyword arguments and constructs
             an aiohttp.ClientSession. It's state will be managed by
-            the HTTPFileSystem class.
+            the HTTPFileSystem class. With the default, synchronous
+            instances on the same loop share one connection pool, unless
+            ``client_kwargs`` gives a ``connector``.
+        range_split_threshold: int or None
+            When downloading with ``get``, files at least this many bytes long
+            are fetched as ``range_split_parts`` concurrent range requests, if
+            the server advertises ``Accept-Ranges: bytes``. None disables this.
+        range_split_parts: int
+            Number of concurrent requests to split large downloads into.
+        parallel_ls: bool
+            If True, ``find``, ``walk``-based ``glob`` and ``du`` list all the
+            directories at one depth concurrently, instead of one after the
+            other.
+        listings_cache_type: "memory" or "file"
+            Where to keep directory listings when ``use_listings_cache`` is
+            True. "file" stores them with ``fsspec.dircache.FileDirCache``, in
+            ``listings_cache_location``, so that they can be reused by other
+            processes with the same request options; this requires
+            ``diskcache``. Its size on disk is bounded by
+            ``listings_cache_size_limit`` bytes, rather than by ``max_paths``.
         storage_options: key-value
             Any other parameters passed on to requests
         cache_type, cache_options: defaults used in open
@@ -93,8 +161,14 @@ class HTTPFileSystem(AsyncFileSystem):
         self.client_kwargs = client_kwargs or {}
         self.get_client = get_client
         self.encoded = encoded
+        self.range_split_threshold = range_split_threshold
+        self.range_split_parts = range_split_parts
+        self.parallel_ls = parallel_ls
         self.kwargs = storage_options
         self._session = None
+        self._executor = None
+        # hosts found not to support multiple ranges in one request
+        self._no_multirange_hosts = set()
 
         # Clean caching-related parameters from `storage_options`
         # before propagating them as `request_options` through `self.kwargs`.
@@ -105,8 +179,21 @@ class HTTPFileSystem(AsyncFileSystem):
         request_options.pop("listings_expiry_time", None)
         request_options.pop("max_paths", None)
         request_options.pop("skip_instance_cache", None)
+        listings_cache_type = request_options.pop("listings_cache_type", "memory")
+        request_options.pop("listings_cache_location", None)
+        request_options.pop("listings_cache_size_limit", None)
         self.kwargs = request_options
 
+        if listings_cache_type == "file":
+            # listings may depend on the headers or credentials used
+            namespace = tokenize(self.kwargs, self.client_kwargs)
+            self.dircache = FileDirCache(namespace=namespace, **storage_options)
+        elif listings_cache_type != "memory":
+            raise ValueError(
+                "listings_cache_type must be 'memory' or 'file', got %s"
+                % listings_cache_type
+            )
+
     @property
     def fsid(self):
         return "http"
@@ -117,23 +204,56 @@ class HTTPFileSystem(AsyncFileSystem):
     @staticmethod
     def close_session(loop, session):
         if loop is not None and loop.is_running():
+            try:
+                if asyncio.get_running_loop() is loop:
+                    # collected on the loop's own thread, cannot wait for it
+                    loop.create_task(session.close())
+                    return
+            except RuntimeError:
+                pass
             try:
                 sync(loop, session.close, timeout=0.1)
                 return
             except (TimeoutError, FSTimeoutError):
                 pass
         connector = getattr(session, "_connector", None)
-        if connector is not None:
+        if connector is not None and getattr(session, "_connector_owner", True):
             # close after loop is dead
             connector._close()
 
     async def set_session(self):
         if self._session is None:
-            self._session = await self.get_client(loop=self.loop, **self.client_kwargs)
+            kw = self.client_kwargs
+            if self._share_connector:
+                # closed at exit, see _close_shared_connectors
+                kw = dict(
+                    kw, connector=_shared_connector(self.loop), connector_owner=False
+                )
+            self._session = await self.get_client(loop=self.loop, **kw)
             if not self.asynchronous:
                 weakref.finalize(self, self.close_session, self.loop, self._session)
         return self._session
 
+    @property
+    def _decompress_executor(self):
+        # a dedicated, bounded pool: its threads block on reads done by the
+        # loop, which may itself need the loop's default executor
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="fsspec-http-decompress"
+            )
+            weakref.finalize(self, self._executor.shutdown, wait=False)
+        return self._executor
+
+    @property
+    def _share_connector(self):
+        # asynchronous users manage (and close) their own sessions
+        return (
+            not self.asynchronous
+            and self.get_client is get_client
+            and "connector" not in self.client_kwargs
+        )
+
     @classmethod
     def _strip_protocol(cls, path):
         """For HTTP, we always want to keep the full URL"""
@@ -156,10 +276,11 @@ class HTTPFileSystem(AsyncFileSystem):
         async with session.get(self.encode_url(url), **self.kwargs) as r:
             self._raise_not_found_for_status(r, url)
             text = await r.text()
+        # with a single group, findall gives the URL strings directly
         if self.simple_links:
-            links = ex2.findall(text) + [u[2] for u in ex.findall(text)]
+            links = ex2.findall(text) + ex.findall(text)
         else:
-            links = [u[2] for u in ex.findall(text)]
+            links = ex.findall(text)
         out = set()
         parts = urlparse(url)
         for l in links:
@@ -230,6 +351,148 @@ class HTTPFileSystem(AsyncFileSystem):
             self._raise_not_found_for_status(r, url)
         return out
 
+    async def _cat_ranges(
+        self,
+        paths,
+        starts,
+        ends,
+        max_gap=None,
+        batch_size=None,
+        on_error="return",
+        **kwargs,
+    ):
+        """Fetch several byte ranges, with one request per URL where possible
+
+        Ranges with non-negative bounds that share a URL are requested together
+        as a multipart/byteranges request (RFC 7233); other ranges, and URLs
+        where the server does not reply with partial content, fall back to one
+        request per range.
+        """
+        if max_gap is not None:
+            raise NotImplementedError
+        if not isinstance(paths, list):
+            raise TypeError
+        if not isinstance(starts, Iterable):
+            starts = [starts] * len(paths)
+        if not isinstance(ends, Iterable):
+            ends = [ends] * len(paths)
+        if len(starts) != len(paths) or len(ends) != len(paths):
+            raise ValueError
+
+        groups = {}
+        for i, (path, start, end) in enumerate(zip(paths, starts, ends)):
+            if (start is None or start >= 0) and (end is None or end >= 0):
+                groups.setdefault(path, []).append(i)
+            else:
+                groups[(i,)] = [i]  # cannot be combined with others
+        coros = []
+        for key, idx in groups.items():
+            ranges = [(starts[i], ends[i]) for i in idx]
+            if len(idx) > 1:
+                coros.append(self._cat_file_ranges(key, ranges, **kwargs))
+            else:
+                i = idx[0]
+                coros.append(
+                    self._cat_file(paths[i], start=starts[i], end=ends[i], **kwargs)
+                )
+        batch_size = batch_size or self.batch_size
+        out = await _run_coros_in_chunks(
+            coros, batch_size=batch_size, nofiles=True, return_exceptions=True
+        )
+
+        results = [None] * len(paths)
+        for idx, res in zip(groups.values(), out):
+            if len(idx) == 1:
+                results[idx[0]] = res
+            elif isinstance(res, BaseException):
+                for i in idx:
+                    results[i] = res
+            else:
+                for i, data in zip(idx, res):
+                    results[i] = data
+        return results
+
+    async def _cat_file_ranges(self, url, ranges, **kwargs):
+        """Fetch several (start, end) ranges of one URL in as few requests as
+        ``max_ranges_per_request`` allows
+        """
+        ranges = [(start or 0, end) for start, end in ranges]
+        n = self.max_ranges_per_request
+        # the first request finds out whether the server supports multiple
+        # ranges, before the others are sent
+        out = [await self._cat_file_multirange(url, ranges[:n], **kwargs)]
+        out.extend(
+            await asyncio.gather(
+                *[
+                    self._cat_file_multirange(url, ranges[i : i + n], **kwargs)
+                    for i in range(n, len(ranges), n)
+                ]
+            )
+        )
+        return [data for chunk in out for data in chunk]
+
+    async def _cat_file_each(self, url, ranges, **kwargs):
+        """Fetch (start, end) ranges of one URL with one request each"""
+        return await asyncio.gather(
+            *[
+                self._cat_file(url, start=start, end=end, **kwargs)
+                for start, end in ranges
+            ],
+            return_exceptions=True,
+        )
+
+    async def _cat_file_multirange(self, url, ranges, **kwargs):
+        """Fetch several (start, end) ranges of one URL in a single request
+
+        Ranges that the response does not cover are fetched one by one. If
+        the server ignores the ranges altogether, later calls for the same
+        host make one request per range straight away.
+        """
+        host = urlparse(url).netloc
+        if host in self._no_multirange_hosts:
+            return await self._cat_file_each(url, ranges, **kwargs)
+        kw = self.kwargs.copy()
+        kw.update(kwargs)
+        wanted = [(start, end) for start, end in ranges if end is None or end > start]
+        if not wanted:
+            return [b""] * len(ranges)
+        headers = kw.pop("headers", {}).copy()
+        headers["Range"] = "bytes=" + ",".join(
+            "%i-%s" % (start, "" if end is None else end - 1) for start, end in wanted
+        )
+        logger.debug(str(url) + " : " + headers["Range"])
+        blocks, size = [], None
+        session = await self.set_session()
+        async with session.get(self.encode_url(url), headers=headers, **kw) as r:
+            self._raise_not_found_for_status(r, url)
+            if r.status != 206:
+                # server ignored the ranges (e.g., object stores); don't
+                # download the whole body, and don't ask this host again
+                self._no_multirange_hosts.add(host)
+            elif r.headers.get("Content-Type", "").startswith("multipart/byteranges"):
+                reader = aiohttp.MultipartReader(r.headers, r.content)
+                while True:
+                    part = await reader.next()
+                    if part is None:
+                        break
+                    m = content_range_ex.match(part.headers.get("Content-Range", ""))
+                    if m is None:
+                        raise ValueError("Bad multipart range response from %s" % url)
+                    size = size if m[3] == "*" else int(m[3])
+                    blocks.append((int(m[1]), await part.read()))
+            else:
+                # server merged the ranges into one, or only sent the first
+                m = content_range_ex.match(r.headers.get("Content-Range", ""))
+                if m is not None and m[3] != "*":
+                    size = int(m[3])
+                blocks.append((int(m[1]) if m else wanted[0][0], await r.read()))
+        out = [_slice_blocks(blocks, start, end, size) for start, end in ranges]
+        missing = [i for i, data in enumerate(out) if data is None]
+        fetched = await self._cat_file_each(url, [ranges[i] for i in missing], **kwargs)
+        for i, data in zip(missing, fetched):
+            out[i] = data
+        return out
+
     async def _get_file(
         self, rpath, lpath, chunk_size=5 * 2**20, callback=_DEFAULT_CALLBACK, **kwargs
     ):
@@ -251,15 +514,105 @@ class HTTPFileSystem(AsyncFileSystem):
                 outfile = open(lpath, "wb")
 
             try:
-                chunk = True
-                while chunk:
-                    chunk = await r.content.read(chunk_size)
-                    outfile.write(chunk)
-                    callback.relative_update(len(chunk))
+                if not isfilelike(lpath) and self._can_split(r, size):
+                    await self._get_file_parts(
+                        r, rpath, outfile, size, chunk_size, callback, **kw
+                    )
+                else:
+                    chunk = True
+                    while chunk:
+                        chunk = await r.content.read(chunk_size)
+                        outfile.write(chunk)
+                        callback.relative_update(len(chunk))
             finally:
                 if not isfilelike(lpath):
                     outfile.close()
 
+    def _can_split(self, response, size):
+        """Whether a download may be fetched as several concurrent ranges"""
+        return (
+            self.range_split_threshold is not None
+            and self.range_split_parts > 1
+            and size is not None
+            and size >= self.range_split_threshold
+            and response.status == 200
+            and response.headers.get("Accept-Ranges") == "bytes"
+            and response.headers.get("Content-Encoding", "identity") == "identity"
+        )
+
+    async def _get_file_parts(
+        self, response, rpath, outfile, size, chunk_size, callback, **kwargs
+    ):
+        """Download into outfile with concurrent range requests
+
+        The first part is streamed from the already open ``response``, the
+        remaining parts are requested separately. All writes happen on the
+        event loop thread, so seeking and writing the shared outfile is safe.
+        If the server does not honour a part request after all, or the file
+        changed since the first response, the whole file is downloaded again
+        with a single GET.
+        """
+        part = -(-size // self.range_split_parts)
+        session = await self.set_session()
+
+        async def write_stream(content, offset, length):
+            while length > 0:
+                chunk = await content.read(min(chunk_size, length))
+                if not chunk:
+                    break
+                outfile.seek(offset)
+                outfile.write(chunk)
+                offset += len(chunk)
+                length -= len(chunk)
+                callback.relative_update(len(chunk))
+
+        # only accept parts of the same version of the file as the first one
+        validator = response.headers.get("ETag")
+        if validator is None or validator.startswith("W/"):
+            # weak ETags cannot be used with If-Range
+            validator = response.headers.get("Last-Modified")
+
+        async def fetch_part(start, end):
+            kw = kwargs.copy()
+            headers = kw.pop("headers", {}).copy()
+            headers["Range"] = "bytes=%i-%i" % (start, end - 1)
+            if validator is not None:
+                headers["If-Range"] = validator
+            async with session.get(self.encode_url(rpath), headers=headers, **kw) as r:
+                self._raise_not_found_for_status(r, rpath)
+                if r.status != 206:
+                    raise _RangeIgnored
+                m = content_range_ex.match(r.headers.get("Content-Range", ""))
+                if m is None or (int(m[1]), int(m[2])) != (start, end - 1):
+                    raise _RangeIgnored
+                await write_stream(r.content, start, end - start)
+
+        tasks = [asyncio.ensure_future(write_stream(response.content, 0, part))]
+        tasks.extend(
+            asyncio.ensure_future(fetch_part(start, min(start + part, size)))
+            for start in range(part, size, part)
+        )
+        try:
+            await asyncio.gather(*tasks)
+            return
+        except _RangeIgnored:
+            logger.debug("Range requests not honoured for %s, refetching", rpath)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        outfile.seek(0)
+        outfile.truncate()
+        callback.absolute_update(0)
+        async with session.get(self.encode_url(rpath), **kwargs) as r:
+            self._raise_not_found_for_status(r, rpath)
+            chunk = True
+            while chunk:
+                chunk = await r.content.read(chunk_size)
+                outfile.write(chunk)
+                callback.relative_update(len(chunk))
+
     async def _put_file(
         self,
         lpath,
@@ -377,13 +730,20 @@ class HTTPFileSystem(AsyncFileSystem):
                 **kw,
             )
 
-    async def open_async(self, path, mode="rb", size=None, **kwargs):
+    async def open_async(self, path, mode="rb", size=None, compression=None, **kwargs):
         session = await self.set_session()
         if size is None:
             try:
                 size = (await self._info(path, **kwargs))["size"]
             except FileNotFoundError:
                 pass
+        if compression is not None:
+            compression = get_compression(path, compression)
+        if compression is not None:
+            if mode != "rb":
+                raise ValueError("Compressed async files only support mode 'rb'")
+            f = await self.open_async(path, mode=mode, size=size, **kwargs)
+            return AsyncCompressedReader(f, compression, self._decompress_executor)
         return AsyncStreamFile(
             self,
             path,
@@ -526,6 +886,62 @@ class HTTPFileSystem(AsyncFileSystem):
         else:
             return list(out)
 
+    async def _find(self, path, maxdepth=None, withdirs=False, **kwargs):
+        if not self.parallel_ls:
+            return await super()._find(
+                path, maxdepth=maxdepth, withdirs=withdirs, **kwargs
+            )
+        # same result as the walk-based version, but listing each depth of the
+        # tree with concurrent requests
+        if maxdepth is not None and maxdepth < 1:
+            raise ValueError("maxdepth must be at least 1")
+        path = self._strip_protocol(path)
+        out = {}
+        detail = kwargs.pop("detail", False)
+        on_error = kwargs.pop("on_error", "omit")
+
+        if withdirs and path != "" and await self._isdir(path):
+            out[path] = await self._info(path)
+
+        level = [path]
+        depth = 0
+        while level and (maxdepth is None or depth < maxdepth):
+            listings = await _run_coros_in_chunks(
+                [self._ls(p, detail=True, **kwargs) for p in level],
+                batch_size=self.batch_size,
+                nofiles=True,
+                return_exceptions=True,
+            )
+            subdirs = []
+            for p, listing in zip(level, listings):
+                if isinstance(listing, OSError):
+                    if on_error == "raise":
+                        raise listing
+                    elif callable(on_error):
+                        on_error(listing)
+                    continue
+                elif isinstance(listing, BaseException):
+                    raise listing
+                for info in listing:
+                    pathname = info["name"].rstrip("/")
+                    if info["type"] == "directory" and pathname != p:
+                        subdirs.append(pathname)
+                        if withdirs:
+                            out[info["name"]] = info
+                    else:
+                        out[info["name"]] = info
+            level = subdirs
+            depth += 1
+
+        if not out and (await self._isfile(path)):
+            # find should also return [path] when path happens to be a file
+            out[path] = {}
+        names = sorted(out)
+        if not detail:
+            return names
+        else:
+            return {name: out[name] for name in names}
+
     async def _isdir(self, path):
         # override, since all URLs are (also) files
         try:
@@ -767,6 +1183,21 @@ class HTTPStreamFile(AbstractBufferedFile):
 
     read = sync_wrapper(_read)
 
+    async def _readinto(self, b):
+        """Fill b from the response stream, without joining chunks first"""
+        out = memoryview(b).cast("B")
+        nread = 0
+        while nread < out.nbytes:
+            chunk = await self.r.content.read(out.nbytes - nread)
+            if not chunk:
+                break
+            out[nread : nread + len(chunk)] = chunk
+            nread += len(chunk)
+        self.loc += nread
+        return nread
+
+    readinto = sync_wrapper(_readinto)
+
     async def _close(self):
         self.r.close()
 
@@ -827,6 +1258,24 @@ async def get_range(session, url, start, end, file=None, **kwargs):
         return out
 
 
+def _slice_blocks(blocks, start, end, size=None):
+    """Find the bytes start:end within a list of (offset, data) blocks
+
+    ``size`` is the total size of the file, if known, so that ranges
+    extending beyond it are truncated. Returns None if not covered.
+    """
+    if end is not None and end <= start:
+        return b""
+    if size is not None and end is not None:
+        end = min(end, size)
+    for offset, data in blocks:
+        # an open-ended range is served by the part extending to end-of-file
+        stop = offset + len(data) if end is None else end
+        if offset <= start < offset + len(data) and stop <= offset + len(data):
+            return bytes(data[start - offset : stop - offset])
+    return None
+
+
 async def _file_info(url, session, size_policy="head", **kwargs):
     """Call HEAD on the server to get details about the file (size/checksum etc.)
 
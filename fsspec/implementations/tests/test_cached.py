@@ -172,6 +172,14 @@ def test_idempotent():
     assert fs2 is fs
     fs3 = pickle.loads(pickle.dumps(fs))
     assert fs3.storage == fs.storage
+    # reconstructed from the storage arguments, so hits the instance cache
+    assert fs3 is fs
+
+    # the pickle does not carry the cache metadata
+    fs = CachingFileSystem("file", skip_instance_cache=True)
+    size = len(pickle.dumps(fs))
+    fs._metadata.cached_files[-1].update({str(i): {"fn": "x"} for i in range(100)})
+    assert len(pickle.dumps(fs)) == size
 
 
 def test_blockcache_workflow(ftp_writable, tmp_path):
@@ -2,14 +2,17 @@ import asyncio
 import io
 import json
 import os
+import pickle
 import sys
 import time
+from urllib.parse import urlparse
 
 import aiohttp
 import pytest
 
 import fsspec.asyn
 import fsspec.utils
+from fsspec.asyn import sync
 from fsspec.implementations.http import HTTPStreamFile
 from fsspec.tests.conftest import data, reset_files, server, win  # noqa: F401
 
@@ -50,7 +53,10 @@ def test_list_cache_with_expiry_time_cached(server):
     assert out == [server + "/index/realfile"]
 
 
-def test_list_cache_with_expiry_time_purged(server):
+def test_list_cache_with_expiry_time_purged(server, monkeypatch):
+    now = [0.0]
+    if not os.environ.get("FSSPEC_TEST_REAL_SLEEP"):
+        monkeypatch.setattr("fsspec.dircache._time", lambda: now[0])
     h = fsspec.filesystem("http", use_listings_cache=True, listings_expiry_time=0.3)
 
     # First, the directory cache is not initialized.
@@ -67,7 +73,10 @@ def test_list_cache_with_expiry_time_purged(server):
     assert len(h.dircache.get(server + "/index/")) == 1
 
     # Wait beyond the TTL / cache expiry time.
-    time.sleep(0.31)
+    if os.environ.get("FSSPEC_TEST_REAL_SLEEP"):
+        time.sleep(0.31)
+    else:
+        now[0] += 0.31
 
     # Verify that the cache item should have been purged.
     cached_items = h.dircache.get(server + "/index/")
@@ -110,6 +119,75 @@ def test_list_cache_reuse(server):
     assert len(h.dircache) == 0
 
 
+def test_list_cache_file(server, tmpdir):
+    pytest.importorskip("diskcache")
+    kw = dict(
+        use_listings_cache=True,
+        listings_cache_type="file",
+        listings_cache_location=str(tmpdir),
+        skip_instance_cache=True,
+    )
+    h = fsspec.filesystem("http", **kw)
+    assert not h.dircache
+    out = h.glob(server + "/index/*")
+    assert out == [server + "/index/realfile"]
+    assert len(h.dircache) == 1
+
+    # a separate instance, as in another process, sees the same listings
+    h = fsspec.filesystem("http", **kw)
+    assert len(h.dircache) == 1
+    assert server + "/index/" in h.dircache
+    assert h.dircache[server + "/index/"] == [
+        {"name": server + "/index/realfile", "size": None, "type": "file"}
+    ]
+    h2 = pickle.loads(pickle.dumps(h))
+    assert server + "/index/" in h2.dircache
+
+    # listings made with other request options are not shared
+    h3 = fsspec.filesystem("http", headers={"give_length": "true"}, **kw)
+    assert not h3.dircache
+
+    h.dircache.clear()
+    assert not h2.dircache
+
+
+def test_list_cache_file_default_location(tmpdir, monkeypatch):
+    pytest.importorskip("diskcache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir))
+    h = fsspec.filesystem(
+        "http",
+        use_listings_cache=True,
+        listings_cache_type="file",
+        skip_instance_cache=True,
+    )
+    location = h.dircache.listings_cache_location
+    assert location == os.path.join(str(tmpdir), "fsspec", "dircache")
+    if not win:
+        assert os.stat(location).st_mode & 0o777 == 0o700
+
+
+def test_find_parallel_ls(server, reset_files):
+    pages = {
+        "/tree": '<a href="/tree/a/">a</a> <a href="/tree/b/">b</a> '
+        '<a href="/tree/f">f</a>',
+        "/tree/a": '<a href="/tree/a/x">x</a> <a href="/tree/a/y">y</a>',
+        "/tree/b": '<a href="/tree/b/z">z</a>',
+    }
+    h = fsspec.filesystem("http")
+    for page, text in pages.items():
+        h.put_file(io.BytesIO(text.encode()), server + page)
+
+    hp = fsspec.filesystem("http", parallel_ls=True)
+    root = server + "/tree"
+    for kw in [{}, {"withdirs": True}, {"maxdepth": 1}, {"detail": True}]:
+        assert hp.find(root, **kw) == h.find(root, **kw)
+    assert hp.find(root) == [root + "/a/x", root + "/a/y", root + "/b/z", root + "/f"]
+    assert hp.glob(root + "/*/*") == h.glob(root + "/*/*")
+    for fs in [h, hp]:
+        with pytest.raises(ValueError):
+            fs.find(root, maxdepth=0)
+
+
 def test_ls_raises_filenotfound(server):
     h = fsspec.filesystem("http")
 
@@ -160,6 +238,20 @@ def test_read(server):
         assert f.read(100) + f.read() == data
 
 
+def test_readinto(server):
+    h = fsspec.filesystem("http")
+    out = server + "/index/realfile"
+    for block_size in [None, 0]:
+        buf = bytearray(100)
+        with h.open(out, "rb", block_size=block_size) as f:
+            assert f.readinto(buf) == 100
+            assert buf == data[:100]
+            rest = bytearray(len(data))
+            assert f.readinto(memoryview(rest)) == len(data) - 100
+            assert rest[: len(data) - 100] == data[100:]
+            assert f.readinto(buf) == 0
+
+
 def test_file_pickle(server):
     import pickle
 
@@ -225,6 +317,22 @@ def test_random_access(server, headers):
     assert f.closed
 
 
+def test_small_reads_single_request(server):
+    # the first read fetches a whole block; later nearby reads use the cache
+    h = fsspec.filesystem("http", headers={"give_length": "true", "head_ok": "true"})
+    url = server + "/index/realfile"
+    with h.open(url, "rb") as f:
+        calls = []
+        fetcher = f.cache.fetcher
+        f.cache.fetcher = lambda start, end: calls.append(start) or fetcher(start, end)
+        assert f.read(5) == data[:5]
+        f.seek(5, 1)
+        assert f.read(5) == data[10:15]
+        f.seek(100)
+        assert f.read(5) == data[100:105]
+    assert calls == [0]
+
+
 @pytest.mark.parametrize(
     "headers",
     [
@@ -300,6 +408,21 @@ def test_download(server, tmpdir):
     h.get(url, fn)
     assert open(fn, "rb").read() == data
 
+    # the file changes between requests, or the server sends the wrong part
+    for header in ["volatile_etag", "shift_range"]:
+        h = fsspec.filesystem(
+            "http",
+            headers={
+                "give_length": "true",
+                "accept_range": "true",
+                "use_206": "true",
+                header: "true",
+            },
+            range_split_threshold=1000,
+        )
+        h.get(url, fn)
+        assert open(fn, "rb").read() == data
+
 
 def test_multi_download(server, tmpdir):
     h = fsspec.filesystem("http", headers={"give_length": "true", "head_ok": "true "})
@@ -312,6 +435,29 @@ def test_multi_download(server, tmpdir):
     assert open(fnb, "rb").read() == data
 
 
+def test_download_range_split(server, tmpdir):
+    h = fsspec.filesystem(
+        "http",
+        headers={"give_length": "true", "accept_range": "true", "use_206": "true"},
+        range_split_threshold=1000,
+        range_split_parts=3,
+    )
+    url = server + "/index/realfile"
+    fn = os.path.join(tmpdir, "afile")
+    h.get(url, fn, chunk_size=1000)
+    assert open(fn, "rb").read() == data
+
+    # server claims range support, but does not reply with partial content:
+    # falls back to a single request
+    h = fsspec.filesystem(
+        "http",
+        headers={"give_length": "true", "accept_range": "true"},
+        range_split_threshold=1000,
+    )
+    h.get(url, fn)
+    assert open(fn, "rb").read() == data
+
+
 def test_ls(server):
     h = fsspec.filesystem("http")
     l = h.ls(server + "/data/20020401/", detail=False)
@@ -358,6 +504,44 @@ def test_mcat_cache(server):
     assert fs.cat([urla, urlb]) == {urla: data, urlb: data}
 
 
+def test_cat_ranges_multipart(server):
+    h = fsspec.filesystem("http", headers={"give_length": "true", "head_ok": "true"})
+    urla = server + "/index/realfile"
+    urlb = server + "/index/otherfile"
+    out = h.cat_ranges(
+        [urla, urla, urla, urlb, urla],
+        [1, 100, 13990, 5, -10],
+        [10, 120, None, 8, None],
+    )
+    assert out == [data[1:10], data[100:120], data[13990:], data[5:8], data[-10:]]
+
+    # ranges past the end of the file are truncated
+    out = h.cat_ranges([urla, urla], [0, 13990], [5, 20000])
+    assert out == [data[:5], data[13990:]]
+
+    # more ranges than fit in one request
+    h = fsspec.filesystem("http", skip_instance_cache=True)
+    h.max_ranges_per_request = 2
+    out = h.cat_ranges([urla] * 5, [0, 10, 20, 30, 40], [5, 15, 25, 35, 45])
+    assert out == [data[i : i + 5] for i in range(0, 50, 10)]
+
+    # server only honours single ranges, so falls back to one request each,
+    # and does so straight away from then on
+    h = fsspec.filesystem("http", headers={"ignore_range": "true"})
+    out = h.cat_ranges([urla, urla], [0, 10], [5, 20])
+    assert out == [data, data]
+    assert h._no_multirange_hosts == {urlparse(server).netloc}
+    out = h.cat_ranges([urla, urla], [0, 10], [5, 20])
+    assert out == [data, data]
+
+    # server only sends the first of the ranges
+    h = fsspec.filesystem(
+        "http", headers={"first_range_only": "true", "use_206": "true"}
+    )
+    out = h.cat_ranges([urla, urla], [0, 10], [5, 20])
+    assert out == [data[:5], data[10:20]]
+
+
 def test_mcat_expand(server):
     h = fsspec.filesystem("http", headers={"give_length": "true", "head_ok": "true "})
     out = h.cat(server + "/index/*")
@@ -419,21 +603,48 @@ def test_docstring():
     assert h.pipe.__doc__
 
 
-def test_async_other_thread(server):
+@pytest.fixture(scope="module")
+def bg_loop():
+    """An event loop running in a background thread"""
     import threading
 
-    loop = asyncio.get_event_loop()
-    th = threading.Thread(target=loop.run_forever)
-
-    th.daemon = True
+    loop = asyncio.new_event_loop()
+    th = threading.Thread(target=loop.run_forever, daemon=True)
     th.start()
+    try:
+        yield loop
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        th.join()
+        loop.close()
+
+
+def test_async_other_thread(server, bg_loop):
+    loop = bg_loop
     fs = fsspec.filesystem("http", asynchronous=True, loop=loop)
-    asyncio.run_coroutine_threadsafe(fs.set_session(), loop=loop).result()
+    session = asyncio.run_coroutine_threadsafe(fs.set_session(), loop=loop).result()
     url = server + "/index/realfile"
     cor = fs._cat([url])
     fut = asyncio.run_coroutine_threadsafe(cor, loop=loop)
     assert fut.result() == {url: data}
-    loop.call_soon_threadsafe(loop.stop)
+    asyncio.run_coroutine_threadsafe(session.close(), loop=loop).result()
+
+
+def test_shared_connector(server):
+    fs = fsspec.filesystem("http", skip_instance_cache=True)
+    fs2 = fsspec.filesystem(
+        "http", skip_instance_cache=True, client_kwargs={"trust_env": True}
+    )
+    session = sync(fs.loop, fs.set_session)
+    session2 = sync(fs2.loop, fs2.set_session)
+    assert session is not session2
+    assert session.cookie_jar is not session2.cookie_jar
+    assert session.connector is session2.connector
+
+    # closing one instance's session leaves the connections of the other
+    sync(fs.loop, session.close)
+    assert not session2.connector.closed
+    assert fs2.cat(server + "/index/realfile") == data
 
 
 def test_async_this_thread(server):
@@ -502,6 +713,26 @@ async def test_async_file(server):
     await fs._session.close()
 
 
+@pytest.mark.asyncio
+async def test_async_file_compressed(server, reset_files):
+    import gzip
+
+    fs = fsspec.filesystem("http", asynchronous=True, skip_instance_cache=True)
+    fn = server + "/index/realfile.gz"
+    await fs._put_file(io.BytesIO(gzip.compress(data)), fn)
+    of = await fs.open_async(fn, compression="infer")
+    async with of as f:
+        out1 = await f.read(10)
+        assert data.startswith(out1)
+        out2 = await f.read()
+        assert data == out1 + out2
+    assert of.afile.closed
+    assert of.executor is fs._decompress_executor
+    with pytest.raises(ValueError):
+        await fs.open_async(fn, mode="wb", compression="infer")
+    await fs._session.close()
+
+
 def test_encoded(server):
     fs = fsspec.filesystem("http", encoded=True)
     out = fs.cat(server + "/Hello%3A%20G%C3%BCnter", headers={"give_path": "true"})
@@ -54,6 +54,8 @@ def register_implementation(name, cls, clobber=False, errtxt=None):
                     "Name (%s) already in the registry and clobber is False" % name
                 )
         else:
+            if getattr(cls, "protocol", None) in ("abstract", None):
+                cls.protocol = name
             _registry[name] = cls
 
 
@@ -215,22 +217,30 @@ def get_filesystem_class(protocol):
     import may fail. In this case, the string in the "err" field of the
     ``known_implementations`` will be given as the error message.
     """
-    if not protocol:
-        protocol = default
+    cls = _registry.get(protocol or default)
+    if cls is None:
+        cls = _load_implementation(protocol or default)
+    return cls
 
-    if protocol not in registry:
-        if protocol not in known_implementations:
-            raise ValueError("Protocol not known: %s" % protocol)
-        bit = known_implementations[protocol]
-        try:
-            register_implementation(protocol, _import_class(bit["class"]))
-        except ImportError as e:
-            raise ImportError(bit["err"]) from e
-    cls = registry[protocol]
-    if getattr(cls, "protocol", None) in ("abstract", None):
-        cls.protocol = protocol
 
-    return cls
+def _load_implementation(protocol):
+    """Import the class for a protocol from ``known_implementations``
+
+    Only called the first time a protocol is used; the class is placed in the
+    registry, so later lookups do not come here.
+    """
+    if protocol not in known_implementations:
+        raise ValueError("Protocol not known: %s" % protocol)
+    bit = known_implementations[protocol]
+    try:
+        register_implementation(protocol, _import_class(bit["class"]))
+    except ImportError as e:
+        # not all entries (e.g., those added to the dict directly) have "err"
+        err = bit.get("err")
+        if not err:
+            err = "%s import failed for protocol %s" % (bit["class"], protocol)
+        raise ImportError(err) from e
+    return _registry[protocol]
 
 
 s3_msg = """Your installed version of s3fs is very old and known to cause
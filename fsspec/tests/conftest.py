@@ -1,10 +1,12 @@
 import contextlib
 import gzip
+import itertools
 import json
 import os
+import re
 import threading
 from collections import ChainMap
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
@@ -17,6 +19,8 @@ listing = open(
     os.path.join(os.path.dirname(__file__), "data", "listing.html"), "rb"
 ).read()
 win = os.name == "nt"
+# one "start-end" item of a Range header; either bound may be empty
+_RANGE_RE = re.compile(r"(\d*)-(\d*)")
 
 
 @pytest.fixture
@@ -36,6 +40,7 @@ class HTTPTestHandler(BaseHTTPRequestHandler):
         "/data/20020401": listing,
     }
     dynamic_files = {}
+    etags = itertools.count()
 
     files = ChainMap(dynamic_files, static_files)
 
@@ -61,19 +66,26 @@ class HTTPTestHandler(BaseHTTPRequestHandler):
             return self._respond(404)
 
         status = 200
-        content_range = "bytes 0-%i/%i" % (len(file_data) - 1, len(file_data))
-        if ("Range" in self.headers) and ("ignore_range" not in self.headers):
-            ran = self.headers["Range"]
-            b, ran = ran.split("=")
-            start, end = ran.split("-")
-            if start:
-                content_range = f"bytes {start}-{end}/{len(file_data)}"
-                file_data = file_data[int(start) : (int(end) + 1) if end else None]
-            else:
-                # suffix only
-                l = len(file_data)
-                content_range = f"bytes {l - int(end)}-{l - 1}/{l}"
-                file_data = file_data[-int(end) :]
+        size = len(file_data)
+        content_range = f"bytes 0-{size - 1}/{size}"
+        etag = None
+        if "volatile_etag" in self.headers:
+            # the file appears to change between any two requests
+            etag = '"%i"' % next(self.etags)
+        if (
+            ("Range" in self.headers)
+            and ("ignore_range" not in self.headers)
+            and self.headers.get("If-Range", etag) == etag
+        ):
+            ranges = _RANGE_RE.findall(self.headers["Range"])
+            if "shift_range" in self.headers:
+                # serve the wrong bytes, but say so in Content-Range
+                ranges = [(str(int(start) + 1), end) for start, end in ranges]
+            if "first_range_only" in self.headers:
+                ranges = ranges[:1]
+            if len(ranges) > 1:
+                return self._respond_multipart(file_data, size, ranges)
+            content_range, file_data = self._apply_range(file_data, size, *ranges)
             if "use_206" in self.headers:
                 status = 206
         if "give_length" in self.headers:
@@ -85,12 +97,54 @@ class HTTPTestHandler(BaseHTTPRequestHandler):
                 }
             else:
                 response_headers = {"Content-Length": len(file_data)}
+            if "accept_range" in self.headers:
+                response_headers["Accept-Ranges"] = "bytes"
+            if status == 206:
+                response_headers["Content-Range"] = content_range
+            if etag is not None:
+                response_headers["ETag"] = etag
             self._respond(status, response_headers, file_data)
         elif "give_range" in self.headers:
             self._respond(status, {"Content-Range": content_range}, file_data)
         else:
             self._respond(status, data=file_data)
 
+    def _apply_range(self, file_data, size, ran):
+        """Slice file_data by one range of a Range header, like ("10", "20")
+
+        Returns the Content-Range header value and the selected bytes, as a
+        memoryview so that the slice is not copied before being written.
+        """
+        start, end = ran
+        if start:
+            start = int(start)
+            end = min(int(end), size - 1) if end else size - 1
+        else:
+            # suffix only
+            start = max(size - int(end), 0)
+            end = size - 1
+        content_range = f"bytes {start}-{end}/{size}"
+        return content_range, memoryview(file_data)[start : end + 1]
+
+    def _respond_multipart(self, file_data, size, ranges):
+        boundary = "THIS_STRING_SEPARATES"
+        body = []
+        for ran in ranges:
+            content_range, part = self._apply_range(file_data, size, ran)
+            body.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/octet-stream\r\n"
+                f"Content-Range: {content_range}\r\n\r\n".encode()
+            )
+            body.extend([part, b"\r\n"])
+        body.append(f"--{boundary}--\r\n".encode())
+        body = b"".join(body)
+        headers = {
+            "Content-Type": f"multipart/byteranges; boundary={boundary}",
+            "Content-Length": len(body),
+        }
+        self._respond(206, headers, body)
+
     def do_POST(self):
         length = self.headers.get("Content-Length")
         file_path = self.path.rstrip("/")
@@ -138,9 +192,8 @@ class HTTPTestHandler(BaseHTTPRequestHandler):
 
             self._respond(200, response_headers)
         elif "give_range" in self.headers:
-            self._respond(
-                200, {"Content-Range": "0-%i/%i" % (len(file_data) - 1, len(file_data))}
-            )
+            size = len(file_data)
+            self._respond(200, {"Content-Range": f"0-{size - 1}/{size}"})
         elif "give_etag" in self.headers:
             self._respond(200, {"ETag": "xxx"})
         else:
@@ -150,7 +203,8 @@ class HTTPTestHandler(BaseHTTPRequestHandler):
 @contextlib.contextmanager
 def serve():
     server_address = ("", port)
-    httpd = HTTPServer(server_address, HTTPTestHandler)
+    httpd = ThreadingHTTPServer(server_address, HTTPTestHandler)
+    httpd.daemon_threads = True
     th = threading.Thread(target=httpd.serve_forever)
     th.daemon = True
     th.start()
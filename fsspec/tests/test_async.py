@@ -131,6 +131,23 @@ def test_run_coros_in_chunks(monkeypatch):
     assert sum(asyncio.run(main())) == 32  # override
 
 
+def test_run_coros_in_chunks_rolling():
+    # a slow coroutine only occupies one slot, rather than blocking its batch
+    finished = []
+
+    async def runner(i, delay):
+        await asyncio.sleep(delay)
+        finished.append(i)
+        return i
+
+    async def main():
+        coros = [runner(0, 0.1)] + [runner(i, 0) for i in range(1, 8)]
+        return await _run_coros_in_chunks(coros, batch_size=2)
+
+    assert asyncio.run(main()) == list(range(8))
+    assert finished == list(range(1, 8)) + [0]
+
+
 @pytest.mark.skipif(os.name != "nt", reason="only for windows")
 def test_windows_policy():
     from asyncio.windows_events import SelectorEventLoop
@@ -118,6 +118,11 @@ def test_zstd_compression(tmpdir):
     ) as infile:
         assert infile.read() == tdat
 
+    with fsspec.core.open(
+        str(tmp_path / "out.zst"), mode="rt", compression="zst"
+    ) as infile:
+        assert infile.read() == tdat
+
     # fails in https://github.com/fsspec/filesystem_spec/issues/725
     infile = fsspec.core.open(
         str(tmp_path / "out.zst"), mode="rb", compression="infer"
@@ -0,0 +1,45 @@
+import datetime
+import pickle
+
+import pytest
+
+from fsspec.dircache import FileDirCache, _json_disk
+
+pytest.importorskip("diskcache")
+
+
+def test_file_dircache_values(tmpdir, monkeypatch):
+    values = {
+        "listing": [{"name": "a", "size": None, "type": "file"}],
+        "bytes": b"raw",
+        "tuple": ("a", 1),
+        "datetime": datetime.datetime(2020, 1, 1),
+    }
+    c = FileDirCache(listings_cache_location=str(tmpdir))
+    for k, v in values.items():
+        c[k] = v
+    for k, v in values.items():
+        assert c[k] == v
+        assert type(c[k]) is type(v)
+
+    # readable by a process without orjson
+    monkeypatch.setattr("fsspec.dircache._import_orjson", lambda: None)
+    _json_disk.cache_clear()
+    try:
+        c = FileDirCache(listings_cache_location=str(tmpdir))
+        assert c["listing"] == values["listing"]
+    finally:
+        _json_disk.cache_clear()
+
+
+def test_file_dircache_size_limit(tmpdir):
+    c = FileDirCache(listings_cache_location=str(tmpdir), listings_cache_size_limit=0)
+    c["a"] = [{"name": "a" * 1000}]
+    c["b"] = [{"name": "b" * 1000}]
+    assert len(c) < 2
+
+    c = pickle.loads(pickle.dumps(c))
+    assert c.listings_cache_size_limit == 0
+
+    with pytest.raises(ValueError):
+        FileDirCache(listings_cache_location=str(tmpdir), max_paths=10)
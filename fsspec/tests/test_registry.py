@@ -71,6 +71,11 @@ def test_register_fail(clear_registry):
     with pytest.raises(ImportError):
         get_filesystem_class("test")
 
+    # entry without an "err" message
+    known_implementations["test"] = {"class": "doesntexist.AbstractFileSystem"}
+    with pytest.raises(ImportError, match="import failed for protocol test"):
+        get_filesystem_class("test")
+
     # NOOP
     register_implementation("test", "doesntexist.AbstractFileSystem", clobber=False)
     with pytest.raises(ValueError):